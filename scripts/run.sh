@@ -23,7 +23,7 @@ echo "  - Sleep Between Posts: ${SLEEP_BETWEEN_POSTS}s"
 echo ""
 echo "Installing dependencies..."
 python3 -m pip install --upgrade pip --quiet
-python3 -m pip install requests beautifulsoup4 --quiet
+python3 -m pip install aiohttp lxml cssselect orjson brotli --quiet
 
 echo "Dependencies installed."
 echo ""
@@ -7,18 +7,29 @@ echo "Starting MULTI-WEBSITE ADVANCED scraper -> WordPress autopost..."
 : "${WP_USERNAME:?Missing}"
 : "${WP_APP_PASSWORD:?Missing}"
 
-python3 -m pip install --user requests beautifulsoup4 lxml >/dev/null 2>&1 || true
+python3 -m pip install --user aiohttp lxml orjson brotli >/dev/null 2>&1 || true
 
 python3 - << 'PY'
-import os, requests, time
-from bs4 import BeautifulSoup
+import os, re, asyncio, aiohttp, orjson
+import html as html_lib
+import lxml.html
+from lxml import etree
+from collections import deque
 from urllib.parse import urljoin
 
 WP = os.environ["WP_SITE_URL"].rstrip("/")
 USER = os.environ["WP_USERNAME"]
 PASS = os.environ["WP_APP_PASSWORD"]
 
-HEADERS = {"User-Agent": "Mozilla/5.0 (RojgarBhaskarBot)"}
+HEADERS = {"User-Agent": "Mozilla/5.0 (RojgarBhaskarBot)", "Accept-Encoding": "gzip, br, deflate"}
+
+TIMEOUT = aiohttp.ClientTimeout(total=15)
+MAX_RETRIES = 3
+MAX_BYTES = 512 * 1024
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Caps in-flight fetches; the shared session keeps connections alive per host
+FETCH_LIMIT = asyncio.Semaphore(8)
 
 SITES = {
     "sarkariresult_cm": "https://sarkariresult.com.cm/",
@@ -27,71 +38,102 @@ SITES = {
     "freejobalert": "https://www.freejobalert.com/latest-notifications/"
 }
 
-def fetch(url):
+# One regex pass per anchor; the matching group names the field it fills
+LINK_KEYWORD_RE = re.compile(
+    r"(?P<apply_online>apply)"
+    r"|(?P<download_notification>notification)"
+    r"|(?P<official_website>official|website)"
+    r"|(?P<admit_card_link>admit|hall ?ticket|call ?letter)",
+    re.I,
+)
+LINK_FIELDS = ("apply_online", "download_notification", "official_website", "admit_card_link")
+
+async def fetch(session, url):
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with FETCH_LIMIT:
+                async with session.get(url, timeout=TIMEOUT) as r:
+                    if r.status not in RETRY_STATUS:
+                        r.raise_for_status()
+                        # Only the top of a page is used; cap memory and parse work
+                        chunks, size = [], 0
+                        async for chunk in r.content.iter_chunked(64 * 1024):
+                            chunks.append(chunk)
+                            size += len(chunk)
+                            if size >= MAX_BYTES: break
+                        return b"".join(chunks)[:MAX_BYTES]
+        except aiohttp.ClientResponseError:
+            return b""
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        if attempt < MAX_RETRIES:
+            await asyncio.sleep(0.5 * 2 ** attempt)
+    return b""
+
+# First div carrying the "content" class, matched in C rather than per-div Python
+CONTENT_DIV_XPATH = etree.XPath('(//div[contains(concat(" ", normalize-space(@class), " "), " content ")])[1]')
+
+# Generic anchors that never name a job post
+JUNK_TITLES = frozenset({"read more", "more details", "click here", "view more", "contact us"})
+
+def parse(html):
     try:
-        r = requests.get(url, headers=HEADERS, timeout=15)
-        r.raise_for_status()
-        return r.text
-    except:
-        return ""
+        return lxml.html.document_fromstring(html)
+    except Exception:
+        return lxml.html.Element("html")
 
 def extract_basic_links(html, base):
-    soup = BeautifulSoup(html, "lxml")
     links = []
-    for a in soup.find_all("a", href=True):
-        title = a.get_text(strip=True)
-        link = urljoin(base, a["href"])
-        if len(title) < 5: continue
+    for a in parse(html).iter("a"):
+        # Cheap href checks first; the text is only built for plausible links
+        href = a.get("href")
+        if href is None or "javascript:" in href: continue
+        link = urljoin(base, href)
         if not link.startswith("http"): continue
-        if "javascript:" in link: continue
+        title = "".join(s.strip() for s in a.itertext())
+        if len(title) < 5 or title.lower() in JUNK_TITLES: continue
         links.append({"title": title, "link": link, "source": base})
-    return links[:20]
+        if len(links) == 20: break
+    return links
 
 def extract_structured_fields(html, url):
-    soup = BeautifulSoup(html, "lxml")
-
-    # Overview
-    overview_block = soup.find("article") or soup.find("div", class_="content")
-    overview_html = str(overview_block) if overview_block else ""
-
-    # Important Dates (pattern based)
-    imp = soup.find_all("table")
-    important_dates_html = ""
-    vacancy_html = ""
-    fee_html = ""
-    age_html = ""
-    sel_html = ""
-    how_html = ""
-
-    if imp:
-        important_dates_html = str(imp[0])
-        if len(imp) > 1: vacancy_html = str(imp[1])
-        if len(imp) > 2: fee_html = str(imp[2])
-        if len(imp) > 3: age_html = str(imp[3])
-        if len(imp) > 4: sel_html = str(imp[4])
+    doc = parse(html)
+
+    overview = None
+    tables = []
+    paras = deque(maxlen=3)  # only the closing paragraphs are used
+    links = dict.fromkeys(LINK_FIELDS, "")
+
+    # One walk over the tree feeds every extractor below
+    for el in doc.iter("article", "table", "p", "a"):
+        tag = el.tag
+        if tag == "table":
+            if len(tables) < 5: tables.append(el)
+        elif tag == "p":
+            paras.append(el)
+        elif tag == "a":
+            href = el.get("href")
+            if href is not None:
+                for m in LINK_KEYWORD_RE.finditer(el.text_content()):
+                    links[m.lastgroup] = href
+        elif overview is None:
+            overview = el
+
+    def html_of(el):
+        return lxml.html.tostring(el, encoding="unicode", with_tail=False)
+
+    # Overview (a .content div is only looked up when there is no <article>)
+    if overview is None:
+        overview = next(iter(CONTENT_DIV_XPATH(doc)), None)
+    overview_html = html_of(overview) if overview is not None else ""
+
+    # Important Dates, Vacancy, Fee, Age, Selection (pattern based, by table order)
+    table_html = [html_of(t) for t in tables]
+    table_html += [""] * (5 - len(table_html))
+    important_dates_html, vacancy_html, fee_html, age_html, sel_html = table_html
 
     # How to apply (fallback paragraphs)
-    paras = soup.find_all("p")
-    how_html = "".join(str(p) for p in paras[-3:]) if paras else ""
-
-    # Important links
-    apply_online = ""
-    download_notification = ""
-    official_website = ""
-    admit_card_link = ""
-
-    for a in soup.find_all("a", href=True):
-        t = a.get_text(strip=True).lower()
-        href = a["href"]
-
-        if "apply" in t:
-            apply_online = href
-        if "notification" in t:
-            download_notification = href
-        if "official" in t or "website" in t:
-            official_website = href
-        if "admit" in t:
-            admit_card_link = href
+    how_html = "".join(html_of(p) for p in paras)
 
     return {
         "overview_html": overview_html,
@@ -101,14 +143,27 @@ def extract_structured_fields(html, url):
         "age_limit_html": age_html,
         "selection_process_html": sel_html,
         "how_to_apply_html": how_html,
-        "apply_online": apply_online,
-        "download_notification": download_notification,
-        "official_website": official_website,
-        "admit_card_link": admit_card_link,
+        **links,
         "source_url": url
     }
 
-def wp_post(title, fields):
+def norm_title(title):
+    return html_lib.unescape(title).strip().lower()
+
+async def wp_titles(session, search=None):
+    params = {"per_page": 100, "orderby": "date", "_fields": "title"}
+    if search:
+        params["search"] = search
+    try:
+        async with session.get(f"{WP}/wp-json/wp/v2/posts", params=params, auth=aiohttp.BasicAuth(USER, PASS),
+                               timeout=aiohttp.ClientTimeout(total=20)) as r:
+            if r.status == 200:
+                return {norm_title(p.get("title", {}).get("rendered", "")) for p in orjson.loads(await r.read())}
+    except Exception as e:
+        print("WP Error:", e)
+    return set()
+
+async def wp_post(session, title, fields):
     url = f"{WP}/wp-json/wp/v2/posts"
     body = {
         "title": title,
@@ -116,34 +171,53 @@ def wp_post(title, fields):
         "meta": fields
     }
     try:
-        r = requests.post(url, json=body, auth=(USER, PASS), timeout=20)
-        print("WP:", r.status_code)
-        if r.status_code in (200,201):
-            print("POSTED:", r.json().get("link"))
-            return True
+        async with session.post(url, data=orjson.dumps(body), headers={"Content-Type": "application/json"},
+                                auth=aiohttp.BasicAuth(USER, PASS),
+                                timeout=aiohttp.ClientTimeout(total=20)) as r:
+            print("WP:", r.status)
+            if r.status in (200,201):
+                print("POSTED:", orjson.loads(await r.read()).get("link"))
+                return True
     except Exception as e:
         print("WP Error:", e)
     return False
 
-# SCRAPING
-all_items = []
-for name, url in SITES.items():
-    html = fetch(url)
-    items = extract_basic_links(html, url)
-    all_items.extend(items)
-
-if not all_items:
-    print("NO DATA FOUND")
-    exit()
-
-latest = all_items[0]
-print("LATEST:", latest["title"], latest["link"])
-
-# FETCH FULL POST
-html = fetch(latest["link"])
-fields = extract_structured_fields(html, latest["link"])
-
-wp_post(latest["title"], fields)
+async def main():
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=8, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+        # SCRAPING (all listing pages, plus the recent-titles listing, in flight at once)
+        posted, *pages = await asyncio.gather(wp_titles(session), *(fetch(session, url) for url in SITES.values()))
+        all_items = []
+        for url, html in zip(SITES.values(), pages):
+            all_items.extend(extract_basic_links(html, url))
+
+        if not all_items:
+            print("NO DATA FOUND")
+            return
+
+        # One listing of recent posts answers the duplicate check for every item
+        latest = None
+        for item in all_items:
+            key = norm_title(item["title"])
+            if key in posted: continue
+            # Empty listing (new site or failed call): fall back to a title search
+            if not posted and key in await wp_titles(session, item["title"]): continue
+            latest = item
+            break
+
+        if latest is None:
+            print("NOTHING NEW")
+            return
+
+        print("LATEST:", latest["title"], latest["link"])
+
+        # FETCH FULL POST
+        html = await fetch(session, latest["link"])
+        fields = extract_structured_fields(html, latest["link"])
+
+        await wp_post(session, latest["title"], fields)
+
+asyncio.run(main())
 
 PY
 
@@ -6,13 +6,29 @@ Scrapes from: FreeJobAlert, SarkariResult IM/CM, Testbook
 """
 
 import os
+import re
+import html as html_lib
 import time
+import gzip
+import random
+import hashlib
+import sqlite3
+import asyncio
 import logging
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, quote
+import threading
+import multiprocessing as mp
+import aiohttp
+import orjson
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from functools import lru_cache
+from itertools import islice
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode, quote
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional
 
 # ============================================================================
 # LOGGING SETUP
@@ -37,13 +53,78 @@ WP_USERNAME = os.environ.get("WP_USERNAME", "")
 WP_APP_PASSWORD = os.environ.get("WP_APP_PASSWORD", "")
 MAX_ITEMS = int(os.environ.get("MAX_ITEMS", "10"))
 SLEEP_BETWEEN_POSTS = int(os.environ.get("SLEEP_BETWEEN_POSTS", "3"))
+# Only for servers that decode gzip request bodies (e.g. nginx/Apache filters)
+WP_GZIP_POSTS = os.environ.get("WP_GZIP_POSTS", "0") == "1"
 USER_AGENT = "Mozilla/5.0 (compatible; RojgarBhaskarBot/1.0; +https://rojgarbhaskar.com)"
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+    # br needs the brotli package for aiohttp to decode it
+    "Accept-Encoding": "gzip, br, deflate",
+}
+STATE_DB = os.environ.get("STATE_DB", "scraper_state.db")
+MAX_CONCURRENCY = int(os.environ.get("CONCURRENCY", "16"))
+PER_HOST_CONCURRENCY = int(os.environ.get("PER_HOST_CONCURRENCY", "8"))
+PER_HOST_RATE = float(os.environ.get("PER_HOST_RATE", "5"))
+MAX_RETRIES = 5
+# Longest Retry-After/X-RateLimit-Reset honoured; a request asked to wait longer is given up
+MAX_THROTTLE_WAIT = 60.0
+# A 5xx can arrive after the write went through, so only these are replayed on it
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+POST_BURST = 4
+MAX_PAGE_BYTES = 512 * 1024
+FALLBACK_LINK_LIMIT = 40
+PAGE_CACHE_SIZE = 256
+KEEPALIVE_TIMEOUT = 75
+PARSE_CACHE_TTL = 7 * 24 * 3600
+# Bump whenever parse_article's output changes so memoized parses are not reused
+PARSER_VERSION = 2
+TITLE_CACHE_PAGES = 3
+BATCH_PREFIX_MIN = 5
+BATCH_PREFIX_MAX = 20
+PARSE_WORKERS = min(8, (os.cpu_count() or 1) * 2)
 
 # Validate Environment Variables
 if not all([WP_SITE_URL, WP_USERNAME, WP_APP_PASSWORD]):
     logger.error("❌ Missing environment variables!")
     exit(1)
 
+WP_AUTH = aiohttp.BasicAuth(WP_USERNAME, WP_APP_PASSWORD)
+
+
+# Link filters, compiled once so each anchor is scanned in a single pass.
+# Anchor text is matched raw, so multi-word keywords allow any whitespace run.
+FJA_KEYWORD_RE = re.compile(r"details|read\s+more|apply", re.I)
+SR_KEYWORD_RE = re.compile(r"apply|notification|details|read\s+more|job|vacancy", re.I)
+TB_HREF_RE = re.compile(r"/blog/|/news/|/career|/jobs")
+
+# Per-thread article parsers (lxml parsers must not be shared across threads)
+PARSERS = threading.local()
+
+# URL fingerprinting: date segments and tracking params do not identify a post
+DATE_SEGMENT_RE = re.compile(r"/\d{4}-\d{2}-\d{2}(?=/|$)|/\d{4}/\d{2}(?:/\d{2})?(?=/)")
+TRACKING_PARAM_RE = re.compile(r"utm_.*|fbclid|gclid|ref|amp", re.I)
+
+# Approximates WordPress's sanitize_title() for batch slug lookups
+SLUG_STRIP_RE = re.compile(r"[^a-z0-9]+")
+
+# Titles sharing this many word pairs (and all their numbers) are one post.
+# Devanagari vowel signs are not \w, so that block is matched explicitly.
+TITLE_TOKEN_RE = re.compile(r"[\w\u0900-\u097f]+")
+NEAR_DUP_THRESHOLD = 0.85
+
+# Post assembly: article body containers in priority order, and the credit line
+# (compiled to XPath once here rather than on every cssselect() call)
+CONTENT_SELECTORS = tuple(
+    CSSSelector(selector)
+    for selector in (".entry-content", ".post-content", ".blog-content", "article", ".content")
+)
+SOURCE_FOOTER = "\n\n<hr/>\n<p><strong>📌 Source:</strong> {source}</p>"
+# Placeholders parse_article returns when it finds nothing usable
+DEFAULT_TITLE = "Job Post"
+NO_CONTENT_HTML = "<p>Content not available</p>"
+PARSE_ERROR_HTML = "<p>Error parsing content</p>"
+
 # Website Configurations
 SITES_CONFIG = {
     "freejobalert.com": {
@@ -78,14 +159,133 @@ SITES_CONFIG = {
     }
 }
 
+# Sites are sharded by type (see run), so more workers than types would idle
+SITE_TYPES = len({site_config["type"] for site_config in SITES_CONFIG.values()})
+WORKERS = int(os.environ.get("WORKERS", str(min(SITE_TYPES, os.cpu_count() or 1))))
+
+# ============================================================================
+# LINK PARSING
+# ============================================================================
+
+def clean_text(text: Optional[str]) -> str:
+    """Collapse all whitespace runs (nbsp included) to single spaces"""
+    return " ".join(text.split()) if text else ""
+
+
+class AnchorTarget:
+    """lxml parser target that collects (href, text) for each <a href>"""
+    
+    def __init__(self):
+        self.anchors: List[Tuple[str, str]] = []
+        self.href: Optional[str] = None
+        self.text: List[str] = []
+    
+    def start(self, tag, attrib):
+        if tag == "a":
+            self.href = attrib.get("href")
+            self.text = []
+    
+    def data(self, data):
+        if self.href is not None:
+            self.text.append(data)
+    
+    def end(self, tag):
+        if tag == "a":
+            if self.href:
+                self.anchors.append((self.href, "".join(self.text)))
+            self.href = None
+    
+    def close(self):
+        return self.anchors
+
+
+def article_parser() -> lxml.html.HTMLParser:
+    """This thread's article parser, which drops comments and PIs while parsing"""
+    parser = getattr(PARSERS, "article", None)
+    if parser is None:
+        parser = PARSERS.article = lxml.html.HTMLParser(remove_comments=True, remove_pis=True)
+    return parser
+
+
+def parse_anchors(html: bytes) -> List[Tuple[str, str]]:
+    """Stream-parse HTML and return (href, text) pairs without building a DOM"""
+    return etree.HTML(html, etree.HTMLParser(target=AnchorTarget()))
+
+
+# Listings overlap across categories, so the same links recur within a run
+@lru_cache(maxsize=4096)
+def url_fingerprint(url: str) -> str:
+    """Collapse trivial URL variants (slash, www, dates, tracking) to one key"""
+    u = urlparse(url)
+    host = u.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = DATE_SEGMENT_RE.sub("/{date}", u.path).rstrip("/").lower()
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(u.query)
+        if not TRACKING_PARAM_RE.fullmatch(k)
+    ))
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+def seen_key(url: str) -> str:
+    """Normalize an article URL for the persistent seen table (host case, fragment, query order)"""
+    u = urlparse(url)
+    query = urlencode(sorted(parse_qsl(u.query, keep_blank_values=True)))
+    return u._replace(netloc=u.netloc.lower(), query=query, fragment="").geturl()
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+class TokenBucket:
+    """Async limiter allowing bursts of `burst` requests, refilled at `rate` per second"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def __aenter__(self):
+        if self.rate <= 0:
+            return self
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return self
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    async def __aexit__(self, *exc):
+        return False
+
 # ============================================================================
 # SCRAPER CLASS
 # ============================================================================
 
 class JobScraper:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": USER_AGENT})
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        self.host_semaphores = defaultdict(lambda: asyncio.Semaphore(PER_HOST_CONCURRENCY))
+        self.host_resume: Dict[str, float] = {}
+        # Polite per-host request rate, bursting up to the connection limit
+        self.host_buckets = defaultdict(lambda: TokenBucket(PER_HOST_RATE, PER_HOST_CONCURRENCY))
+        # Spaces posts SLEEP_BETWEEN_POSTS apart on average without serializing
+        # them; worker processes each get an equal share of that budget
+        post_interval = SLEEP_BETWEEN_POSTS * max(1, WORKERS)
+        self.post_bucket = TokenBucket(1 / post_interval if post_interval > 0 else 0, POST_BURST)
+        self.title_cache: Set[str] = set()
+        self.new_titles: Set[str] = set()
+        self.title_cache_loaded: Optional[asyncio.Future] = None
+        self.title_shingles: List[Tuple[frozenset, frozenset]] = []
+        self.db: Optional[sqlite3.Connection] = None
+        self.page_fetches: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self.page_validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
         self.stats = {
             "total_processed": 0,
             "total_posted": 0,
@@ -93,135 +293,423 @@ class JobScraper:
             "total_errors": 0,
         }
     
-    def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch webpage content"""
+    def open_state(self, new_run: bool = False) -> None:
+        """Open the SQLite store of article URLs and titles handled in previous runs"""
+        # Autocommit: worker processes share this file, so no write may hold
+        # the lock beyond its own statement
+        self.db = sqlite3.connect(STATE_DB, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS seen(url TEXT PRIMARY KEY, posted_at INTEGER)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS posted(title_key TEXT PRIMARY KEY, posted_at INTEGER)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS validators(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS parsed(html_hash TEXT PRIMARY KEY, title TEXT, content TEXT, parsed_at INTEGER)"
+        )
+        self.db.execute("DELETE FROM parsed WHERE parsed_at < ?", (int(time.time()) - PARSE_CACHE_TTL,))
+        # Per-run claims shared by the worker processes (titles being posted,
+        # article bodies already taken); a crashed run must not leave them behind
+        self.db.execute("CREATE TABLE IF NOT EXISTS claimed_titles(title_key TEXT PRIMARY KEY)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS claimed_content(content_hash TEXT PRIMARY KEY)")
+        if new_run:
+            self.db.execute("DELETE FROM claimed_titles")
+            self.db.execute("DELETE FROM claimed_content")
+    
+    def close_state(self) -> None:
+        """Close the state store"""
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+    
+    def is_seen(self, url: str) -> bool:
+        """Check whether an article URL was handled in an earlier run"""
+        # Date segments stay significant here: next year's notification often
+        # differs from this year's only in its /YYYY/MM/ path
+        return self.db.execute(
+            "SELECT 1 FROM seen WHERE url IN (?, ?)", (seen_key(url), url)
+        ).fetchone() is not None
+    
+    def mark_seen(self, url: str) -> None:
+        """Record an article URL as handled"""
+        self.db.execute("INSERT OR IGNORE INTO seen VALUES (?, ?)", (seen_key(url), int(time.time())))
+    
+    def is_posted(self, title_key: str) -> bool:
+        """Check whether a normalized title is known to exist in WordPress"""
+        return self.db.execute("SELECT 1 FROM posted WHERE title_key = ?", (title_key,)).fetchone() is not None
+    
+    def mark_posted(self, title_key: str) -> None:
+        """Record a normalized title as existing in WordPress"""
+        self.db.execute("INSERT OR IGNORE INTO posted VALUES (?, ?)", (title_key, int(time.time())))
+    
+    def claim_title(self, title_key: str) -> bool:
+        """Reserve a title for posting; False if another article in this run holds it"""
+        return self.db.execute("INSERT OR IGNORE INTO claimed_titles VALUES (?)", (title_key,)).rowcount == 1
+    
+    def release_title(self, title_key: str) -> None:
+        """Give up a title reservation once its post is done or has failed"""
+        self.db.execute("DELETE FROM claimed_titles WHERE title_key = ?", (title_key,))
+    
+    def claim_content(self, content_hash: str) -> bool:
+        """Reserve an article body; False if this run already took the same body"""
+        return self.db.execute("INSERT OR IGNORE INTO claimed_content VALUES (?)", (content_hash,)).rowcount == 1
+    
+    def load_parsed(self, html_hash: str) -> Optional[Tuple[str, str]]:
+        """Return the (title, content) parsed earlier from identical HTML"""
+        return self.db.execute(
+            "SELECT title, content FROM parsed WHERE html_hash = ?", (html_hash,)
+        ).fetchone()
+    
+    def save_parsed(self, html_hash: str, title: str, content: str) -> None:
+        """Memoize a parse result by the hash of its raw HTML"""
+        self.db.execute(
+            "INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?)", (html_hash, title, content, int(time.time()))
+        )
+    
+    def save_validators(self, url: str) -> None:
+        """Persist the ETag/Last-Modified last served for a listing page"""
+        etag, last_modified = self.page_validators.pop(url, (None, None))
+        if etag or last_modified:
+            self.db.execute("INSERT OR REPLACE INTO validators VALUES (?, ?, ?)", (url, etag, last_modified))
+    
+    @staticmethod
+    def retry_delay(response: aiohttp.ClientResponse, attempt: int) -> float:
+        """Seconds to wait before retrying a throttled or failed request"""
+        retry_after = response.headers.get("Retry-After")
+        if response.status == 429 and retry_after:
+            try:
+                return min(MAX_THROTTLE_WAIT, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return min(30, 2 ** attempt) + random.random() * 0.5
+    
+    @staticmethod
+    def throttle_delay(response: aiohttp.ClientResponse) -> float:
+        """Seconds a host asked every client to hold off, from its rate-limit headers (uncapped)"""
+        headers = response.headers
+        try:
+            if "Retry-After" in headers:
+                return max(0.0, float(headers["Retry-After"]))
+            if headers.get("X-RateLimit-Remaining") == "0":
+                reset = float(headers.get("X-RateLimit-Reset", "1"))
+                # Some hosts send an epoch timestamp, others a number of seconds
+                if reset > 1e9:
+                    reset -= time.time()
+                return max(0.0, reset)
+        except ValueError:
+            pass
+        return 0.0
+    
+    async def request(self, method: str, url: str, max_bytes: Optional[int] = None,
+                      **kwargs) -> Tuple[aiohttp.ClientResponse, bytes]:
+        """Send request under per-host limit, retrying on 429 (and 5xx when idempotent)"""
+        host = urlparse(url).netloc
+        for attempt in range(MAX_RETRIES + 1):
+            pause = self.host_resume.get(host, 0) - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            
+            async with self.host_buckets[host], self.host_semaphores[host], self.semaphore:
+                async with self.session.request(method, url, **kwargs) as response:
+                    body = await (self.read_capped(response, max_bytes) if max_bytes else response.read())
+            
+            # Back off only when the host signals it; otherwise go straight on
+            throttle = self.throttle_delay(response)
+            if throttle > 0:
+                pause = min(throttle, MAX_THROTTLE_WAIT)
+                self.host_resume[host] = max(self.host_resume.get(host, 0), time.monotonic() + pause)
+                logger.warning(f"🐢 {host} asked to slow down, pausing it for {pause:.1f}s")
+            
+            retryable = response.status == 429 or (
+                response.status >= 500 and method in IDEMPOTENT_METHODS
+            )
+            if not retryable or attempt == MAX_RETRIES:
+                return response, body
+            
+            # An hour-long Retry-After would outlast the whole run; fail this request instead
+            if throttle > MAX_THROTTLE_WAIT:
+                logger.warning(f"🛑 {host} asked to wait {throttle:.0f}s, giving up on {url}")
+                return response, body
+            
+            delay = self.retry_delay(response, attempt)
+            logger.warning(f"🔁 {response.status} from {host}, retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    @staticmethod
+    async def read_capped(response: aiohttp.ClientResponse, max_bytes: int) -> bytes:
+        """Stream a (decompressed) body, truncating it at max_bytes"""
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                logger.warning(f"✂️  Truncated {response.url} at {max_bytes // 1024} KB")
+                break
+        return b"".join(chunks)[:max_bytes]
+    
+    async def fetch_page(self, url: str, conditional: bool = False) -> Optional[bytes]:
+        """Fetch a page once per run; concurrent callers share the in-flight request"""
+        if conditional:
+            return await self.download_page(url, conditional)
+        
+        task = self.page_fetches.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self.download_page(url))
+            self.page_fetches[url] = task
+            if len(self.page_fetches) > PAGE_CACHE_SIZE:
+                self.page_fetches.popitem(last=False)
+        else:
+            self.page_fetches.move_to_end(url)
+        return await asyncio.shield(task)
+    
+    async def download_page(self, url: str, conditional: bool = False) -> Optional[bytes]:
+        """Fetch raw webpage bytes (lxml handles the charset itself)
+        
+        A conditional fetch revalidates against the stored ETag/Last-Modified
+        and returns b"" when the page is unchanged.
+        """
         try:
             logger.info(f"📥 Fetching: {url}")
-            response = self.session.get(url, timeout=20)
+            headers = {}
+            if conditional:
+                row = self.db.execute(
+                    "SELECT etag, last_modified FROM validators WHERE url = ?", (url,)
+                ).fetchone()
+                if row:
+                    if row[0]:
+                        headers["If-None-Match"] = row[0]
+                    if row[1]:
+                        headers["If-Modified-Since"] = row[1]
+            
+            response, body = await self.request(
+                "GET", url, max_bytes=MAX_PAGE_BYTES, headers=headers, timeout=aiohttp.ClientTimeout(total=20)
+            )
+            if response.status == 304:
+                logger.info(f"💤 Unchanged since last run: {url}")
+                return b""
             response.raise_for_status()
-            return response.text
+            if conditional:
+                self.page_validators[url] = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            return body
         except Exception as e:
             logger.error(f"❌ Fetch error: {str(e)}")
             self.stats["total_errors"] += 1
             return None
     
-    def extract_links_freejobalert(self, html: str, base_url: str) -> List[str]:
+    def extract_links_freejobalert(self, html: bytes, base_url: str) -> Dict[str, str]:
         """Extract job links from Free Job Alert"""
         try:
-            soup = BeautifulSoup(html, "lxml")
-            links = []
-            
-            for a in soup.find_all("a", href=True):
-                text = a.get_text(strip=True).lower()
-                href = a['href']
-                
-                if any(x in text for x in ["get details", "read more", "details", "apply"]):
-                    full_url = urljoin(base_url, href)
-                    if full_url not in links:
-                        links.append(full_url)
+            anchors = parse_anchors(html)
+            links = {
+                urljoin(base_url, href): text for href, text in anchors
+                if FJA_KEYWORD_RE.search(text)
+            }
             
             if not links:
-                for a in soup.find_all("a", href=True):
-                    href = a['href']
-                    if "freejobalert.com" in href and href.count("-") >= 2:
-                        full_url = urljoin(base_url, href)
-                        if full_url not in links:
-                            links.append(full_url)
+                # Slug-looking links; only the first few are ever processed
+                fallback = (
+                    (urljoin(base_url, href), text) for href, text in anchors
+                    if "freejobalert.com" in href and href.count("-") >= 2
+                )
+                for full_url, text in fallback:
+                    links.setdefault(full_url, text)
+                    if len(links) >= FALLBACK_LINK_LIMIT:
+                        break
             
             logger.info(f"🔗 Found {len(links)} links")
             return links
         except Exception as e:
             logger.error(f"Extract error: {str(e)}")
-            return []
+            return {}
     
-    def extract_links_sarkariresult(self, html: str, base_url: str) -> List[str]:
+    def extract_links_sarkariresult(self, html: bytes, base_url: str) -> Dict[str, str]:
         """Extract job links from Sarkari Result"""
         try:
-            soup = BeautifulSoup(html, "lxml")
-            links = []
-            
-            for a in soup.find_all("a", href=True):
-                text = a.get_text(strip=True).lower()
-                href = a['href']
-                
-                keywords = ["apply", "notification", "details", "read more", "job", "vacancy"]
-                if any(x in text for x in keywords):
-                    full_url = urljoin(base_url, href)
-                    if full_url not in links:
-                        links.append(full_url)
+            links = {
+                urljoin(base_url, href): text for href, text in parse_anchors(html)
+                if SR_KEYWORD_RE.search(text)
+            }
             
             logger.info(f"🔗 Found {len(links)} links")
             return links
         except Exception as e:
             logger.error(f"Extract error: {str(e)}")
-            return []
+            return {}
     
-    def extract_links_testbook(self, html: str, base_url: str) -> List[str]:
+    def extract_links_testbook(self, html: bytes, base_url: str) -> Dict[str, str]:
         """Extract job links from Testbook"""
         try:
-            soup = BeautifulSoup(html, "lxml")
-            links = []
-            
-            for a in soup.find_all("a", href=True):
-                href = a['href']
-                
-                if any(x in href for x in ["/blog/", "/news/", "/career", "/jobs"]):
-                    full_url = urljoin(base_url, href)
-                    if full_url not in links:
-                        links.append(full_url)
+            links = {
+                urljoin(base_url, href): text for href, text in parse_anchors(html)
+                if TB_HREF_RE.search(href)
+            }
             
             logger.info(f"🔗 Found {len(links)} links")
             return links
         except Exception as e:
             logger.error(f"Extract error: {str(e)}")
-            return []
+            return {}
     
-    def parse_article(self, html: str, site_type: str) -> Tuple[str, str]:
+    def parse_article(self, html: bytes, site_type: str) -> Tuple[str, str]:
         """Parse article content"""
         try:
-            soup = BeautifulSoup(html, "lxml")
+            doc = lxml.html.document_fromstring(html, parser=article_parser())
             
-            # Extract Title
-            title = ""
-            h1 = soup.find("h1")
-            if h1:
-                title = h1.get_text(strip=True)
+            # Extract Title (one walk finds both <title> and the first <h1>)
+            h1 = page_title = None
+            for el in doc.iter("title", "h1"):
+                if el.tag == "h1":
+                    h1 = el
+                    break
+                if page_title is None:
+                    page_title = el
             
-            if not title:
-                title_tag = soup.find("title")
-                if title_tag:
-                    title = title_tag.get_text(strip=True)[:100]
+            title = clean_text(h1.text_content()) if h1 is not None else ""
+            if not title and page_title is not None:
+                title = clean_text(page_title.text)[:100]
             
             # Extract Content
-            content_selectors = [".entry-content", ".post-content", ".blog-content", "article", ".content"]
             content_element = None
             
-            for selector in content_selectors:
-                content_element = soup.select_one(selector)
-                if content_element:
+            for selector in CONTENT_SELECTORS:
+                matches = selector(doc)
+                if matches:
+                    content_element = matches[0]
                     break
             
-            if content_element:
-                for tag in content_element(["script", "style", "noscript"]):
-                    tag.decompose()
-                content_html = str(content_element)
+            if content_element is not None:
+                # Stripped after parsing: only libxml2 knows where these blocks really end
+                etree.strip_elements(content_element, "script", "style", "noscript", "iframe", with_tail=False)
+                content_html = lxml.html.tostring(content_element, encoding="unicode", with_tail=False)
             else:
-                paragraphs = soup.find_all("p")
+                paragraphs = list(islice(doc.iter("p"), 50))
                 if paragraphs:
                     content_html = "\n".join(
-                        f"<p>{p.get_text(strip=True)}</p>" 
-                        for p in paragraphs[:50]
+                        f"<p>{html_lib.escape(clean_text(p.text_content()), quote=False)}</p>"
+                        for p in paragraphs
                     )
                 else:
-                    content_html = "<p>Content not available</p>"
+                    content_html = NO_CONTENT_HTML
             
-            return title or "Job Post", content_html
+            return title or DEFAULT_TITLE, content_html
         except Exception as e:
             logger.error(f"Parse error: {str(e)}")
-            return "Job Post", "<p>Error parsing content</p>"
+            return DEFAULT_TITLE, PARSE_ERROR_HTML
+    
+    @staticmethod
+    def normalize_title(title: str) -> str:
+        """Normalize a title for duplicate comparison"""
+        return html_lib.unescape(title).strip().lower()
+    
+    async def load_title_cache(self) -> None:
+        """Prefetch recent WordPress post titles for local duplicate checks"""
+        try:
+            # Page 1 reports how many pages exist; the rest are fetched together
+            total_pages = await self.load_title_page(1)
+            await asyncio.gather(*(
+                self.load_title_page(page)
+                for page in range(2, min(total_pages, TITLE_CACHE_PAGES) + 1)
+            ))
+            
+            logger.info(f"🗂️  Cached {len(self.title_cache)} existing titles")
+        except Exception as e:
+            logger.error(f"Title cache error: {str(e)}")
+    
+    async def load_title_page(self, page: int) -> int:
+        """Add one page of recent titles to the cache and return WordPress's page count"""
+        response, body = await self.request(
+            "GET",
+            f"{WP_SITE_URL}/wp-json/wp/v2/posts",
+            params={"per_page": 100, "page": page, "_fields": "title"},
+            auth=WP_AUTH,
+            timeout=aiohttp.ClientTimeout(total=20)
+        )
+        if response.status != 200:
+            return 0
+        
+        self.title_cache.update(
+            self.normalize_title(post.get("title", {}).get("rendered", ""))
+            for post in orjson.loads(body)
+        )
+        return int(response.headers.get("X-WP-TotalPages", "1"))
+    
+    async def prefetch_titles(self, titles: List[str]) -> None:
+        """Check a batch of titles with one prefix search instead of one each"""
+        pending = [
+            normalized for normalized in map(self.normalize_title, titles)
+            if normalized not in self.title_cache and not self.is_posted(normalized)
+        ]
+        if len(pending) < 2:
+            return
+        
+        prefix = os.path.commonprefix(pending)[:BATCH_PREFIX_MAX].strip()
+        if len(prefix) < BATCH_PREFIX_MIN:
+            await self.prefetch_slugs(pending)
+            return
+        
+        try:
+            response, body = await self.request(
+                "GET",
+                f"{WP_SITE_URL}/wp-json/wp/v2/posts",
+                params={"search": prefix, "per_page": 100, "_fields": "title"},
+                auth=WP_AUTH,
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+            if response.status != 200:
+                return
+            
+            posts = orjson.loads(body)
+        except Exception as e:
+            logger.error(f"Batch check error: {str(e)}")
+            return
+        
+        found = {self.normalize_title(post.get("title", {}).get("rendered", "")) for post in posts}
+        self.title_cache.update(found)
+        
+        # A full page may be truncated, so absence only proves anything below it
+        if len(posts) < 100:
+            self.new_titles.update(normalized for normalized in pending if normalized not in found)
     
-    def wp_post_exists(self, title: str) -> bool:
+    async def prefetch_slugs(self, pending: List[str]) -> None:
+        """Look unrelated titles up by their likely slugs in a single request"""
+        slugs = {SLUG_STRIP_RE.sub("-", normalized).strip("-"): normalized for normalized in pending}
+        slugs.pop("", None)
+        if len(slugs) < 2:
+            return
+        
+        try:
+            response, body = await self.request(
+                "GET",
+                f"{WP_SITE_URL}/wp-json/wp/v2/posts",
+                params={"slug": ",".join(slugs), "per_page": 100, "_fields": "title"},
+                auth=WP_AUTH,
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+            if response.status != 200:
+                return
+            
+            posts = orjson.loads(body)
+        except Exception as e:
+            logger.error(f"Batch check error: {str(e)}")
+            return
+        
+        # WordPress may slug a title differently, so a miss proves nothing and
+        # those titles still get their own search
+        found = {self.normalize_title(post.get("title", {}).get("rendered", "")) for post in posts}
+        self.title_cache.update(found.intersection(pending))
+    
+    async def wp_post_exists(self, title: str) -> bool:
         """Check if post already exists in WordPress"""
+        normalized = self.normalize_title(title)
+        if normalized in self.title_cache or self.is_posted(normalized):
+            self.title_cache.add(normalized)
+            logger.info(f"⏭️  Post exists: {title[:50]}...")
+            self.stats["total_skipped"] += 1
+            return True
+        
+        if normalized in self.new_titles:
+            return False
+        
         try:
             url = f"{WP_SITE_URL}/wp-json/wp/v2/posts"
             params = {
@@ -230,28 +718,33 @@ class JobScraper:
                 "_fields": "id,title"
             }
             
-            response = self.session.get(
+            response, body = await self.request(
+                "GET",
                 url,
                 params=params,
-                auth=(WP_USERNAME, WP_APP_PASSWORD),
-                timeout=10
+                auth=WP_AUTH,
+                timeout=aiohttp.ClientTimeout(total=10)
             )
+            if response.status != 200:
+                return False
             
-            if response.status_code == 200:
-                posts = response.json()
-                for post in posts:
-                    post_title = post.get("title", {}).get("rendered", "").strip().lower()
-                    if post_title == title.strip().lower():
-                        logger.info(f"⏭️  Post exists: {title[:50]}...")
-                        self.stats["total_skipped"] += 1
-                        return True
+            posts = orjson.loads(body)
+            found = any(
+                self.normalize_title(post.get("title", {}).get("rendered", "")) == normalized
+                for post in posts
+            )
             
-            return False
+            if found:
+                self.title_cache.add(normalized)
+                self.mark_posted(normalized)
+                logger.info(f"⏭️  Post exists: {title[:50]}...")
+                self.stats["total_skipped"] += 1
+            return found
         except Exception as e:
             logger.error(f"Check exists error: {str(e)}")
             return False
     
-    def wp_create_post(self, title: str, content: str, source: str) -> bool:
+    async def wp_create_post(self, title: str, content: str, source: str) -> bool:
         """Create post in WordPress"""
         try:
             if not title or not content:
@@ -262,106 +755,292 @@ class JobScraper:
             
             post_data = {
                 "title": title[:200],
-                "content": f"{content}\n\n<hr/>\n<p><strong>📌 Source:</strong> {source}</p>",
+                "content": content + SOURCE_FOOTER.format(source=source),
                 "status": "publish",
                 "categories": [1]
             }
             
-            response = self.session.post(
-                url,
-                json=post_data,
-                auth=(WP_USERNAME, WP_APP_PASSWORD),
-                timeout=30
-            )
+            payload = orjson.dumps(post_data)
+            headers = {"Content-Type": "application/json"}
+            if WP_GZIP_POSTS:
+                payload = gzip.compress(payload, compresslevel=6)
+                headers["Content-Encoding"] = "gzip"
             
-            if response.status_code in [200, 201]:
-                response_data = response.json()
-                post_link = response_data.get("link", "")
-                logger.info(f"✅ Posted: {title[:50]}... ({post_link})")
-                self.stats["total_posted"] += 1
-                return True
-            else:
-                logger.error(f"❌ WordPress error {response.status_code}")
+            async with self.post_bucket:
+                response, body = await self.request(
+                    "POST",
+                    url,
+                    data=payload,
+                    headers=headers,
+                    auth=WP_AUTH,
+                    timeout=aiohttp.ClientTimeout(total=30)
+                )
+            
+            if response.status not in [200, 201]:
+                logger.error(f"❌ WordPress error {response.status}")
                 self.stats["total_errors"] += 1
                 return False
+            
+            response_data = orjson.loads(body)
+            normalized = self.normalize_title(title)
+            self.title_cache.add(normalized)
+            self.mark_posted(normalized)
+            post_link = response_data.get("link", "")
+            logger.info(f"✅ Posted: {title[:50]}... ({post_link})")
+            self.stats["total_posted"] += 1
+            return True
         except Exception as e:
             logger.error(f"❌ Create post error: {str(e)}")
             self.stats["total_errors"] += 1
             return False
     
-    def process_category(self, category_url: str, site_name: str, site_type: str) -> int:
+    async def fetch_article(self, link: str, site_type: str) -> Optional[Tuple[str, str]]:
+        """Fetch and parse a single article"""
+        self.stats["total_processed"] += 1
+        
+        logger.info(f"\n📄 Processing article {self.stats['total_processed']}...")
+        
+        article_html = await self.fetch_page(link)
+        if not article_html:
+            return None
+        
+        # Articles left unposted by a failed run come back unchanged; reuse their parse
+        html_hash = f"{PARSER_VERSION}:{hashlib.blake2b(article_html, digest_size=16).hexdigest()}"
+        cached = self.load_parsed(html_hash)
+        if cached:
+            title, content = cached
+        else:
+            title, content = await asyncio.to_thread(self.parse_article, article_html, site_type)
+            # Placeholder results are not memoized; a parser fix should get another go
+            if title != DEFAULT_TITLE and content not in (NO_CONTENT_HTML, PARSE_ERROR_HTML):
+                self.save_parsed(html_hash, title, content)
+        
+        if not title or not content:
+            logger.warning("⚠️  Empty title or content, skipping...")
+            return None
+        
+        # Syndicated notifications reappear under new titles; skip identical bodies
+        content_hash = hashlib.blake2b(clean_text(content).encode(), digest_size=16).hexdigest()
+        if not self.claim_content(content_hash):
+            logger.info(f"⏭️  Duplicate content: {title[:50]}...")
+            self.stats["total_skipped"] += 1
+            return None
+        
+        # Skipped for this run only; a false match must not lose the post for good
+        if self.is_near_duplicate(title):
+            logger.info(f"⏭️  Near-duplicate title: {title[:50]}...")
+            self.stats["total_skipped"] += 1
+            return None
+        
+        return title, content
+    
+    def is_near_duplicate(self, title: str) -> bool:
+        """Check a title against this run's titles by Jaccard similarity of word 2-grams"""
+        tokens = TITLE_TOKEN_RE.findall(self.normalize_title(title))
+        if not tokens:
+            return False
+        shingles = frozenset(zip(tokens, tokens[1:])) or frozenset([(tokens[0],)])
+        numbers = frozenset(token for token in tokens if token.isdigit())
+        for seen_numbers, seen in self.title_shingles:
+            # A different year or post count is never the same notification
+            if numbers != seen_numbers:
+                continue
+            if len(shingles & seen) >= NEAR_DUP_THRESHOLD * len(shingles | seen):
+                return True
+        self.title_shingles.append((numbers, shingles))
+        return False
+    
+    async def publish_article(self, link: str, title: str, content: str, site_name: str) -> bool:
+        """Post a parsed article unless it already exists"""
+        # Claimed before the first await (and across worker processes) so a
+        # concurrent article with the same title waits for the next run instead
+        # of racing this one to WordPress
+        normalized = self.normalize_title(title)
+        if not self.claim_title(normalized):
+            logger.info(f"⏭️  Same title in progress: {title[:50]}...")
+            self.stats["total_skipped"] += 1
+            return False
+        
+        try:
+            if await self.wp_post_exists(title):
+                self.mark_seen(link)
+                return False
+            
+            if not await self.wp_create_post(title, content, site_name):
+                return False
+            
+            self.mark_seen(link)
+            return True
+        finally:
+            self.release_title(normalized)
+    
+    async def process_category(self, category_url: str, site_name: str, site_type: str) -> int:
         """Process single category and scrape jobs"""
         logger.info(f"\n🔄 Processing: {category_url}")
         
-        html = self.fetch_page(category_url)
+        html = await self.fetch_page(category_url, conditional=True)
         if not html:
             return 0
         
         if site_type == "freejobalert":
-            links = self.extract_links_freejobalert(html, category_url)
+            extract_links = self.extract_links_freejobalert
         elif site_type == "sarkariresult":
-            links = self.extract_links_sarkariresult(html, category_url)
+            extract_links = self.extract_links_sarkariresult
         elif site_type == "testbook":
-            links = self.extract_links_testbook(html, category_url)
+            extract_links = self.extract_links_testbook
         else:
-            links = self.extract_links_freejobalert(html, category_url)
+            extract_links = self.extract_links_freejobalert
+        
+        # Parse off the event loop so in-flight fetches keep progressing
+        links = await asyncio.to_thread(extract_links, html, category_url)
         
         if not links:
             logger.warning(f"⚠️  No links found")
             return 0
         
+        # Links handled in a previous run never need fetching again. Filtered
+        # before the fingerprint pass, so a handled /2024/05/ post cannot take
+        # the slot of an unhandled /2025/05/ one
+        unseen_links = [link for link in links if not self.is_seen(link)]
+        if len(unseen_links) < len(links):
+            logger.info(f"⏭️  {len(links) - len(unseen_links)} links already handled")
+        
+        # Keep the first URL per fingerprint so variants are fetched once
+        by_fingerprint: Dict[str, str] = {}
+        for link in unseen_links:
+            by_fingerprint.setdefault(url_fingerprint(link), link)
+        new_links = list(by_fingerprint.values())
+        
+        # Listings that name the post in the anchor let known titles skip the article fetch
+        fresh_links = []
+        for link in new_links:
+            if self.is_posted(self.normalize_title(clean_text(links[link]))):
+                logger.info(f"⏭️  Post exists: {clean_text(links[link])[:50]}...")
+                self.stats["total_skipped"] += 1
+                self.mark_seen(link)
+            else:
+                fresh_links.append(link)
+        new_links = fresh_links[:MAX_ITEMS]
+        
+        parsed = await asyncio.gather(
+            *(self.fetch_article(link, site_type) for link in new_links),
+            return_exceptions=True
+        )
+        
+        articles = []
+        for link, result in zip(new_links, parsed):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Article error: {str(result)}")
+                self.stats["total_errors"] += 1
+            elif result:
+                articles.append((link, *result))
+        
+        await self.title_cache_loaded
+        await self.prefetch_titles([title for _, title, _ in articles])
+        
+        results = await asyncio.gather(
+            *(self.publish_article(link, title, content, site_name) for link, title, content in articles),
+            return_exceptions=True
+        )
+        
         posted_count = 0
-        for link in links[:MAX_ITEMS]:
-            self.stats["total_processed"] += 1
-            
-            logger.info(f"\n📄 Processing article {self.stats['total_processed']}...")
-            
-            article_html = self.fetch_page(link)
-            if not article_html:
-                continue
-            
-            title, content = self.parse_article(article_html, site_type)
-            
-            if not title or not content:
-                logger.warning("⚠️  Empty title or content, skipping...")
-                continue
-            
-            if self.wp_post_exists(title):
-                continue
-            
-            if self.wp_create_post(title, content, site_name):
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"❌ Article error: {str(result)}")
+                self.stats["total_errors"] += 1
+            elif result:
                 posted_count += 1
-            
-            time.sleep(SLEEP_BETWEEN_POSTS)
+        
+        # Only trust a 304 next run once nothing on this listing is left over,
+        # including variants the fingerprint pass set aside this time
+        if all(self.is_seen(link) for link in links):
+            self.save_validators(category_url)
         
         return posted_count
     
+    async def scrape_sites(self, sites: Dict[str, dict]) -> int:
+        """Scrape every category of the given sites concurrently"""
+        jobs = []
+        for site_key, site_config in sites.items():
+            site_name = site_config["name"]
+            site_type = site_config["type"]
+            categories = site_config["categories"]
+            
+            logger.info(f"🌐 Queued: {site_name} ({len(categories)} categories)")
+            
+            for category_url in categories:
+                jobs.append(self.process_category(category_url, site_name, site_type))
+        
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=PARSE_WORKERS)
+        )
+        
+        self.open_state()
+        try:
+            # WordPress is idle while articles are scraped; keep its TLS
+            # connections warm across that gap instead of re-handshaking
+            connector = aiohttp.TCPConnector(
+                limit=64, limit_per_host=PER_HOST_CONCURRENCY, ttl_dns_cache=300, keepalive_timeout=KEEPALIVE_TIMEOUT
+            )
+            async with aiohttp.ClientSession(
+                connector=connector,
+                headers=DEFAULT_HEADERS,
+                auto_decompress=True
+            ) as session:
+                self.session = session
+                # Titles are only needed once articles are parsed, so load them
+                # while the listing and article pages are being fetched
+                self.title_cache_loaded = asyncio.ensure_future(self.load_title_cache())
+                results = await asyncio.gather(*jobs, return_exceptions=True)
+                await self.title_cache_loaded
+        finally:
+            self.close_state()
+        
+        total_posted = 0
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"❌ Category error: {str(result)}")
+                self.stats["total_errors"] += 1
+            else:
+                total_posted += result
+        
+        return total_posted
+    
     def run(self) -> None:
         """Main execution"""
         logger.info("=" * 70)
         logger.info("🚀 RojgarBhaskar Auto-Poster Started")
         logger.info(f"⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         logger.info(f"📊 Max items per category: {MAX_ITEMS}")
+        logger.info(f"🧵 Worker processes: {WORKERS}")
         logger.info("=" * 70)
         
-        total_posted = 0
+        # Clear the previous run's claims once, before any worker starts
+        self.open_state(new_run=True)
+        self.close_state()
         
-        for site_key, site_config in SITES_CONFIG.items():
-            site_name = site_config["name"]
-            site_type = site_config["type"]
-            categories = site_config["categories"]
-            
-            logger.info(f"\n{'='*70}")
-            logger.info(f"🌐 Processing: {site_name}")
-            logger.info(f"{'='*70}")
+        if WORKERS <= 1:
+            asyncio.run(self.scrape_sites(SITES_CONFIG))
+        else:
+            # Shard sites across processes so parsing is not bound by one GIL.
+            # Mirrors share a site type and syndicate the same posts, so each
+            # type stays in one process where near-duplicate titles can meet.
+            by_type: Dict[str, dict] = defaultdict(dict)
+            for site_key, site_config in SITES_CONFIG.items():
+                by_type[site_config["type"]][site_key] = site_config
+            shards = [{} for _ in range(WORKERS)]
+            for i, sites in enumerate(by_type.values()):
+                shards[i % WORKERS].update(sites)
             
-            for category_url in categories:
-                try:
-                    posted = self.process_category(category_url, site_name, site_type)
-                    total_posted += posted
-                except Exception as e:
-                    logger.error(f"❌ Category error: {str(e)}")
-                    self.stats["total_errors"] += 1
+            with ProcessPoolExecutor(max_workers=WORKERS) as executor:
+                futures = [executor.submit(scrape_sites_worker, shard) for shard in shards if shard]
+                for future in as_completed(futures):
+                    try:
+                        for key, value in future.result().items():
+                            self.stats[key] += value
+                    except Exception as e:
+                        logger.error(f"❌ Worker error: {str(e)}")
+                        self.stats["total_errors"] += 1
         
         logger.info(f"\n{'='*70}")
         logger.info("✅ SUMMARY")
@@ -373,10 +1052,18 @@ class JobScraper:
         logger.info(f"{'='*70}")
         logger.info("🎉 Scraper Finished!")
 
+
+def scrape_sites_worker(sites: Dict[str, dict]) -> Dict[str, int]:
+    """Process pool entry point: scrape a shard of sites and return its stats"""
+    scraper = JobScraper()
+    asyncio.run(scraper.scrape_sites(sites))
+    return scraper.stats
+
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
 if __name__ == "__main__":
+    mp.set_start_method("spawn", force=True)
     scraper = JobScraper()
     scraper.run()
@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
 import os
+import re
+import html as html_lib
 import time
 import logging
+import orjson
 import requests
+import lxml.html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 from datetime import datetime
 
 # Logging
@@ -25,6 +32,12 @@ WP_APP_PASSWORD = os.environ.get("WP_APP_PASSWORD", "")
 MAX_ITEMS = int(os.environ.get("MAX_ITEMS", "10"))
 SLEEP_BETWEEN_POSTS = int(os.environ.get("SLEEP_BETWEEN_POSTS", "3"))
 USER_AGENT = "Mozilla/5.0 (compatible; RojgarBhaskarBot/1.0)"
+POOL_SIZE = 32
+FETCH_WORKERS = 8
+TITLE_CACHE_PAGES = 3
+
+LINK_KEYWORD_RE = re.compile(r"details|read\s+more|apply", re.I)
+SOURCE_FOOTER = "\n\n<hr/>\n<p><strong>Source:</strong> {source}</p>"
 
 if not all([WP_SITE_URL, WP_USERNAME, WP_APP_PASSWORD]):
     logger.error("Missing environment variables")
@@ -49,10 +62,33 @@ SITES_CONFIG = {
     }
 }
 
+def link_key(url):
+    # Same article reached via a trailing slash, www. or an #anchor
+    u = urlsplit(url)
+    host = u.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    key = host + u.path.rstrip("/")
+    return f"{key}?{u.query}" if u.query else key
+
 class JobScraper:
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": USER_AGENT})
+        # Pooled keep-alive connections, retried on rate limits and 5xx
+        adapter = HTTPAdapter(
+            pool_connections=POOL_SIZE,
+            pool_maxsize=POOL_SIZE,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.title_cache = set()
+        self.seen_links = set()
         self.stats = {
             "total_processed": 0,
             "total_posted": 0,
@@ -65,25 +101,29 @@ class JobScraper:
             logger.info(f"Fetching: {url}")
             response = self.session.get(url, timeout=20)
             response.raise_for_status()
-            return response.text
+            # Raw bytes: lxml reads the page's own charset, skipping requests' detection pass
+            return response.content
         except Exception as e:
             logger.error(f"Fetch error: {str(e)}")
             self.stats["total_errors"] += 1
             return None
     
+    def fetch_article(self, link):
+        article_html = self.fetch_page(link)
+        if not article_html:
+            return None
+        return self.parse_article(article_html)
+    
     def extract_links(self, html, base_url):
         try:
-            soup = BeautifulSoup(html, "lxml")
-            links = []
-            
-            for a in soup.find_all("a", href=True):
-                text = a.get_text(strip=True).lower()
-                href = a['href']
-                
-                if any(x in text for x in ["details", "read more", "apply"]):
-                    full_url = urljoin(base_url, href)
-                    if full_url not in links:
-                        links.append(full_url)
+            # Listing pages only need their anchors; lxml walks them without
+            # building a soup
+            links = list(dict.fromkeys(
+                urljoin(base_url, a.get("href"))
+                for a in lxml.html.document_fromstring(html).iter("a")
+                if a.get("href") is not None
+                and LINK_KEYWORD_RE.search("".join(s.strip() for s in a.itertext()))
+            ))
             
             logger.info(f"Found {len(links)} links")
             return links
@@ -129,10 +169,45 @@ class JobScraper:
             logger.error(f"Parse error: {str(e)}")
             return "Job Post", "<p>Error parsing</p>"
     
+    @staticmethod
+    def normalize_title(title):
+        return html_lib.unescape(title).strip().lower()
+    
+    def load_title_cache(self):
+        # Recent titles answer most duplicate checks without a search request
+        try:
+            url = f"{WP_SITE_URL}/wp-json/wp/v2/posts"
+            page, total_pages = 1, 1
+            while page <= min(total_pages, TITLE_CACHE_PAGES):
+                response = self.session.get(
+                    url,
+                    params={"per_page": 100, "page": page, "_fields": "title"},
+                    auth=(WP_USERNAME, WP_APP_PASSWORD),
+                    timeout=20
+                )
+                if response.status_code != 200:
+                    break
+                self.title_cache.update(
+                    self.normalize_title(post.get("title", {}).get("rendered", ""))
+                    for post in orjson.loads(response.content)
+                )
+                total_pages = int(response.headers.get("X-WP-TotalPages", "1"))
+                page += 1
+            
+            logger.info(f"Cached {len(self.title_cache)} existing titles")
+        except Exception as e:
+            logger.error(f"Title cache error: {str(e)}")
+    
     def wp_post_exists(self, title):
+        normalized = self.normalize_title(title)
+        if normalized in self.title_cache:
+            logger.info(f"Post exists: {title[:50]}")
+            self.stats["total_skipped"] += 1
+            return True
+        
         try:
             url = f"{WP_SITE_URL}/wp-json/wp/v2/posts"
-            params = {"search": title, "per_page": 5}
+            params = {"search": title, "per_page": 5, "_fields": "title"}
             
             response = self.session.get(
                 url,
@@ -142,10 +217,10 @@ class JobScraper:
             )
             
             if response.status_code == 200:
-                posts = response.json()
+                posts = orjson.loads(response.content)
                 for post in posts:
-                    post_title = post.get("title", {}).get("rendered", "").strip().lower()
-                    if post_title == title.strip().lower():
+                    if self.normalize_title(post.get("title", {}).get("rendered", "")) == normalized:
+                        self.title_cache.add(normalized)
                         logger.info(f"Post exists: {title[:50]}")
                         self.stats["total_skipped"] += 1
                         return True
@@ -165,20 +240,22 @@ class JobScraper:
             
             post_data = {
                 "title": title[:200],
-                "content": f"{content}\n\n<hr/>\n<p><strong>Source:</strong> {source}</p>",
+                "content": content + SOURCE_FOOTER.format(source=source),
                 "status": "publish",
                 "categories": [1]
             }
             
             response = self.session.post(
                 url,
-                json=post_data,
+                data=orjson.dumps(post_data),
+                headers={"Content-Type": "application/json"},
                 auth=(WP_USERNAME, WP_APP_PASSWORD),
                 timeout=30
             )
             
             if response.status_code in [200, 201]:
                 logger.info(f"Posted: {title[:50]}")
+                self.title_cache.add(self.normalize_title(title))
                 self.stats["total_posted"] += 1
                 return True
             else:
@@ -203,17 +280,30 @@ class JobScraper:
             logger.warning("No links found")
             return 0
         
+        # Category listings overlap; fetch each article once per run
+        new_links = []
+        for link in links:
+            key = link_key(link)
+            if key not in self.seen_links:
+                self.seen_links.add(key)
+                new_links.append(link)
+                if len(new_links) == MAX_ITEMS:
+                    break
+        
+        # Article fetches are network-bound; overlap them, then post in order
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            articles = list(pool.map(self.fetch_article, new_links))
+        
         posted_count = 0
-        for link in links[:MAX_ITEMS]:
+        for article in articles:
             self.stats["total_processed"] += 1
             
             logger.info(f"Processing article {self.stats['total_processed']}")
             
-            article_html = self.fetch_page(link)
-            if not article_html:
+            if not article:
                 continue
             
-            title, content = self.parse_article(article_html)
+            title, content = article
             
             if not title or not content:
                 logger.warning("Empty title or content")
@@ -236,6 +326,7 @@ class JobScraper:
         logger.info("="*70)
         
         total_posted = 0
+        self.load_title_cache()
         
         for site_key, site_config in SITES_CONFIG.items():
             site_name = site_config["name"]